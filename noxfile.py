@@ -11,7 +11,14 @@ docs_requirements = ("mkdocs", "mkdocs-material", "mkautodoc>=0.1.0")
 
 @nox.session(python=["3.6", "3.7", "3.8"])
 def test(session):
-    session.install("--upgrade", "pytest", "pytest-asyncio", "pytest-cov", "trio")
+    session.install(
+        "--upgrade",
+        "pytest",
+        "pytest-asyncio",
+        "pytest-cov",
+        "trio",
+        'uvloop; sys_platform != "win32" and implementation_name == "cpython"',
+    )
     session.install("-e", ".")
 
     options = session.posargs
@@ -2,15 +2,37 @@ import httpx
 import pytest
 
 import respx
-from respx.fixtures import session_event_loop as event_loop  # noqa: F401
+from respx import MockTransport
 
+try:
+    import uvloop
+except ImportError:  # pragma: nocover
+    uvloop = None
 
-@pytest.fixture
-async def client():
+if uvloop is not None:
+
+    @pytest.fixture(scope="session")
+    def event_loop():
+        loop = uvloop.new_event_loop()
+        yield loop
+        loop.close()
+
+else:  # pragma: nocover
+    from respx.fixtures import session_event_loop as event_loop  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+async def client(event_loop):  # noqa: F811
     async with httpx.AsyncClient() as client:
         yield client
 
 
+@pytest.fixture
+def respx_mock():
+    with MockTransport() as respx_mock:
+        yield respx_mock
+
+
 @pytest.fixture
 async def my_mock():
     async with respx.mock(base_url="https://httpx.mock") as respx_mock: